@@ -12,6 +12,10 @@ import subprocess
 import json
 import traceback
 import re # For detecting playlist URLs
+import html
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 # --- Global Variables ---
 video_info_json = None # Store the parsed JSON output from yt-dlp
@@ -19,6 +23,15 @@ available_formats = {} # Map user-friendly format descriptions to yt-dlp format
 available_captions = {} # Map language names to yt-dlp language codes
 is_playlist = False # Flag to indicate if the current URL is a playlist
 
+# --- Subtitle Batch Settings ---
+SUBTITLE_FETCH_WORKERS = 8 # Concurrent track downloads, all sharing one pooled HTTP session
+SUBTITLE_CONVERT_WORKERS = max(2, (os.cpu_count() or 2) // 2) # Threads converting/writing fetched tracks
+SUBTITLE_FETCH_RETRIES = 5 # Per track, with exponential backoff; covers YouTube's 429 throttling
+SUBTITLE_FORMATS = ["srt", "vtt"]
+SUBTITLE_FILE_RE = re.compile(r'\[([\w-]+)\]\.([\w.@-]+)\.(srt|vtt)$') # "<title> [<id>].<lang>.<ext>"
+SUBTITLE_TIMESTAMP_RE = re.compile(r'(?:(\d+):)?(\d{2}):(\d{2})\.(\d{3})')
+SUBTITLE_TAG_RE = re.compile(r'<[^>]*>')
+
 # --- Appearance Settings ---
 ctk.set_appearance_mode("System")  # Modes: "System" (default), "Dark", "Light"
 ctk.set_default_color_theme("blue")  # Themes: "blue" (default), "green", "dark-blue"
@@ -291,7 +304,7 @@ def download_finished(success, message, return_code=None):
             full_message += f"\n(yt-dlp exit code: {return_code})"
         messagebox.showerror("Error", full_message)
 
-    ui_set_controls_state(True)
+    ui_set_controls_state(video_info_json is not None) # A subtitle batch may run without any fetched info
     ui_set_fetch_button_state(True)
 
 
@@ -374,6 +387,279 @@ def download_video_thread(url, format_code, subtitle_lang, save_path, output_tem
         # ---
 
 
+# --- Subtitle Batch Logic ---
+
+def parse_subtitle_languages(lang_filter):
+    """Parses a comma-separated language filter ('all', 'en', 'pt.*') into regex patterns. None means all.
+
+    Matching ignores case and must cover the whole code; a bare code like 'en' also takes its variants ('en-US').
+    """
+    items = [item.strip() for item in lang_filter.split(',') if item.strip()]
+    if not items or any(item.lower() == 'all' for item in items):
+        return None
+    patterns = []
+    for item in items:
+        if re.fullmatch(r'[A-Za-z0-9]+', item):
+            item = re.escape(item) + r'(-.*)?'
+        patterns.append(re.compile(item, re.IGNORECASE)) # Raises re.error on a bad pattern
+    return patterns
+
+def select_subtitle_tracks(info, lang_patterns, include_auto):
+    """Returns (lang_code, formats_list, is_auto) tuples wanted from a video's info. Manual tracks win over auto ones.
+
+    Without a language filter only the original auto track is taken ('<lang>-orig', else the video's own
+    language), not YouTube's ~150 machine translations of it. Original auto tracks are saved under '<lang>'.
+    """
+    selected = {}
+    sources = [(info.get('subtitles') or {}, False)]
+    if include_auto:
+        auto_data = info.get('automatic_captions') or {}
+        if lang_patterns is None:
+            originals = {code: subs for code, subs in auto_data.items() if code.endswith('-orig')}
+            if not originals and info.get('language') in auto_data:
+                originals = {info['language']: auto_data[info['language']]}
+            auto_data = originals
+        # Originals first, so 'en-orig' wins over the 'en' translation of the same speech
+        sources.append((dict(sorted(auto_data.items(), key=lambda item: not item[0].endswith('-orig'))), True))
+    for subtitles_data, is_auto in sources:
+        for lang_code, subs_list in subtitles_data.items():
+            if lang_code == 'live_chat' or not isinstance(subs_list, list):
+                continue
+            if lang_patterns is not None and not any(p.fullmatch(lang_code) for p in lang_patterns):
+                continue
+            save_code = lang_code[:-len('-orig')] if is_auto and lang_code.endswith('-orig') else lang_code
+            if save_code in selected:
+                continue
+            selected[save_code] = (save_code, subs_list, is_auto)
+    return list(selected.values())
+
+def pick_subtitle_track(subs_list, target_ext):
+    """Picks the track to download: the target format if offered, otherwise one we can convert (vtt/srt)."""
+    by_ext = {s.get('ext'): s for s in subs_list if s.get('url')}
+    for ext in (target_ext, 'vtt', 'srt'):
+        if ext in by_ext:
+            return by_ext[ext]
+    return None
+
+def sanitize_filename(name):
+    """Replaces characters that are invalid in file names (Windows rules) and trims length."""
+    return re.sub(r'[\\/:*?"<>|\r\n\t]', '_', name).strip(' .')[:150] or "untitled"
+
+def scan_existing_subtitles(save_path):
+    """Collects (video_id, lang, ext) for subtitle files already in save_path, so renamed titles still count."""
+    existing = set()
+    for filename in os.listdir(save_path):
+        match = SUBTITLE_FILE_RE.search(filename)
+        if match:
+            existing.add(match.groups())
+    return existing
+
+def vtt_timestamp_to_srt(timestamp):
+    """Converts '01:02.345' or '00:01:02.345' to the SRT form '00:01:02,345'."""
+    match = SUBTITLE_TIMESTAMP_RE.search(timestamp)
+    if not match:
+        raise ValueError(f"Invalid subtitle timestamp: {timestamp!r}")
+    hours, minutes, seconds, millis = match.groups()
+    return f"{int(hours or 0):02d}:{minutes}:{seconds},{millis}"
+
+def vtt_to_srt(vtt_text, is_auto=False):
+    """Converts WebVTT text to SRT, stripping styling tags (and, for auto captions, their rolling duplicates)."""
+    cues = []
+    # Only truly empty lines end a cue: auto captions put a single-space line inside cues
+    blocks = re.split(r'\n\n+', vtt_text.replace('\r\n', '\n').replace('\r', '\n'))
+    for block in blocks:
+        lines = block.strip('\n').split('\n')
+        timing_index = next((i for i, line in enumerate(lines) if '-->' in line), None)
+        if timing_index is None:
+            continue # WEBVTT header, NOTE, STYLE and REGION blocks
+        start, _, end = lines[timing_index].partition('-->')
+        end = end.strip().split(' ')[0] # Drop cue settings like "align:start position:0%"
+        text_lines = [html.unescape(SUBTITLE_TAG_RE.sub('', line)).strip() for line in lines[timing_index + 1:]]
+        text_lines = [line for line in text_lines if line]
+        # Auto captions repeat the previous cue's last line at the top of the next one
+        if is_auto and cues and text_lines and text_lines[0] == cues[-1][2][-1]:
+            text_lines.pop(0)
+        if not text_lines:
+            continue
+        cues.append((vtt_timestamp_to_srt(start), vtt_timestamp_to_srt(end), text_lines))
+
+    return "".join(
+        f"{index}\n{start} --> {end}\n" + "\n".join(text_lines) + "\n\n"
+        for index, (start, end, text_lines) in enumerate(cues, 1)
+    )
+
+def srt_to_vtt(srt_text):
+    """Converts SRT text to WebVTT (timestamp separators only; numbering is valid VTT cue ids)."""
+    body = re.sub(r'(\d{2}:\d{2}:\d{2}),(\d{3})', r'\1.\2', srt_text.replace('\r\n', '\n'))
+    return "WEBVTT\n\n" + body.lstrip('\ufeff')
+
+def convert_and_save_subtitle(text, source_ext, target_ext, out_path, is_auto=False):
+    """Converts a fetched track to target_ext if needed and writes it atomically (no partial files on disk).
+
+    Empty or cue-less tracks raise instead of being written, since a file on disk marks the language as done.
+    """
+    if not text.strip():
+        raise ValueError(f"Empty subtitle track for {out_path}")
+    if source_ext == target_ext:
+        converted = text
+    elif source_ext == 'vtt' and target_ext == 'srt':
+        converted = vtt_to_srt(text, is_auto)
+    elif source_ext == 'srt' and target_ext == 'vtt':
+        converted = srt_to_vtt(text)
+    else:
+        raise ValueError(f"Cannot convert {source_ext} subtitles to {target_ext}")
+    if '-->' not in converted:
+        raise ValueError(f"No subtitle cues in track for {out_path}")
+
+    temp_path = out_path + ".part"
+    try:
+        with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(converted)
+        os.replace(temp_path, out_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def subtitle_batch_thread(urls, lang_patterns, sub_format, include_auto, save_path):
+    """Downloads subtitle tracks only, for every video yt-dlp lists for the given URLs/playlists.
+
+    Tracks are fetched by a thread pool over one pooled requests.Session while yt-dlp is still
+    listing further videos; fetched tracks are converted and written by a second pool.
+    """
+    app.after(0, lambda: progress_bar.configure(mode='determinate'))
+    app.after(0, lambda: progress_bar.set(0))
+    app.after(0, lambda: status_label.configure(text="Status: Listing videos for subtitle batch via yt-dlp..."))
+
+    counts = {'videos': 0, 'queued': 0, 'saved': 0, 'skipped': 0, 'failed': 0, 'unavailable': 0}
+    counts_lock = threading.Lock()
+    last_update = [0.0]
+
+    def report_progress(force=False):
+        """Pushes counters to the GUI, throttled so thousands of tracks don't flood the event loop."""
+        now = time.monotonic()
+        with counts_lock:
+            if not force and now - last_update[0] < 0.25:
+                return
+            last_update[0] = now
+            snapshot = dict(counts)
+        done = snapshot['saved'] + snapshot['failed']
+        text = (f"Status: Subtitles - {snapshot['videos']} videos, {snapshot['saved']} saved, "
+                f"{snapshot['skipped']} already on disk, {snapshot['failed']} failed, {snapshot['unavailable']} unavailable")
+        app.after(0, lambda: status_label.configure(text=text))
+        if snapshot['queued']:
+            app.after(0, lambda: progress_bar.set(done / snapshot['queued']))
+
+    def count(key):
+        with counts_lock:
+            counts[key] += 1
+        report_progress()
+
+    session = requests.Session()
+    retries = Retry(total=SUBTITLE_FETCH_RETRIES, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504), respect_retry_after_header=True)
+    adapter = HTTPAdapter(pool_connections=SUBTITLE_FETCH_WORKERS, pool_maxsize=SUBTITLE_FETCH_WORKERS, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    fetch_pool = ThreadPoolExecutor(max_workers=SUBTITLE_FETCH_WORKERS)
+    convert_pool = ThreadPoolExecutor(max_workers=SUBTITLE_CONVERT_WORKERS)
+    process = None
+    result = None # download_finished() arguments, posted only once both pools have drained
+
+    def on_converted(future):
+        if future.cancelled():
+            return
+        if future.exception():
+            print(f"Subtitle conversion failed: {future.exception()}")
+            count('failed')
+        else:
+            count('saved')
+
+    def fetch_track(track, out_path, is_auto):
+        """Runs in fetch_pool: downloads one track and hands it to convert_pool."""
+        try:
+            response = session.get(track['url'], timeout=30)
+            response.raise_for_status()
+            response.encoding = 'utf-8'
+            future = convert_pool.submit(convert_and_save_subtitle, response.text, track.get('ext'), sub_format, out_path, is_auto)
+            future.add_done_callback(on_converted)
+        except Exception as e:
+            print(f"Subtitle fetch failed for {out_path}: {e}")
+            count('failed')
+
+    try:
+        existing = scan_existing_subtitles(save_path)
+        command = ['yt-dlp', '--dump-json', '--no-warnings', '--skip-download', '--ignore-errors']
+        command.extend(urls)
+        print(f"Executing subtitle listing command: {' '.join(command)}")
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding='utf-8', creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
+
+        error_lines = []
+        for line in process.stdout: # One JSON object per video, streamed as yt-dlp extracts them
+            if not line.startswith('{'):
+                error_lines.append(line.strip())
+                print(f"yt-dlp: {line.strip()}")
+                continue
+            try:
+                info = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Skipping unparsable yt-dlp output line: {e}")
+                continue
+
+            video_id = info.get('id', 'unknown')
+            base_name = f"{sanitize_filename(info.get('title', video_id))} [{video_id}]"
+            count('videos')
+            for lang_code, subs_list, is_auto in select_subtitle_tracks(info, lang_patterns, include_auto):
+                if (video_id, lang_code, sub_format) in existing:
+                    count('skipped')
+                    continue
+                track = pick_subtitle_track(subs_list, sub_format)
+                if track is None:
+                    print(f"No vtt/srt track for {video_id} [{lang_code}], skipping.")
+                    count('unavailable')
+                    continue
+                existing.add((video_id, lang_code, sub_format)) # Don't queue the same language twice
+                out_path = os.path.join(save_path, f"{base_name}.{lang_code}.{sub_format}")
+                with counts_lock:
+                    counts['queued'] += 1
+                fetch_pool.submit(fetch_track, track, out_path, is_auto)
+
+        process.wait()
+        fetch_pool.shutdown(wait=True) # Every conversion is submitted once all fetches are done
+        convert_pool.shutdown(wait=True)
+        report_progress(force=True)
+
+        summary = (f"Subtitle batch finished for {counts['videos']} video(s).\n"
+                   f"Saved: {counts['saved']}, already on disk: {counts['skipped']}, failed: {counts['failed']}\n"
+                   f"Unavailable (no vtt/srt track offered): {counts['unavailable']}\n"
+                   f"(Saved to folder: {save_path})")
+        if counts['videos'] == 0 and process.returncode != 0:
+            error_output = "\n".join(error_lines)
+            result = (False, f"yt-dlp failed.\nOutput:\n{error_output[:500]}...", process.returncode)
+        elif counts['failed'] or process.returncode != 0:
+            if process.returncode != 0:
+                summary += "\nSome videos could not be listed (see console output)."
+            result = (False, summary, process.returncode or None)
+        else:
+            result = (True, summary)
+
+    except FileNotFoundError:
+        result = (False, "yt-dlp command not found. Is it installed and in PATH?")
+    except Exception as e:
+        print(f"Unexpected error during subtitle batch: {e}")
+        print(traceback.format_exc())
+        result = (False, f"An unexpected Python error occurred: {e}")
+    finally:
+        if process is not None and process.poll() is None: # Stop a playlist listing that would outlive the failed batch
+            process.kill()
+            process.wait()
+        # Already drained on success; after a failure, drop queued tracks instead of writing them
+        fetch_pool.shutdown(wait=True, cancel_futures=True)
+        convert_pool.shutdown(wait=True, cancel_futures=True)
+        session.close()
+        if result is not None:
+            app.after(0, download_finished, *result)
+
+
 def start_fetch():
     """Starts fetching info in a new thread."""
     fetch_thread = threading.Thread(target=fetch_video_info_thread, daemon=True)
@@ -431,6 +717,44 @@ def start_download():
     )
     download_thread.start()
 
+def start_subtitle_batch():
+    """Validates input and starts a subtitle-only batch download in a new thread."""
+    urls = url_entry.get().split() # Several video/playlist URLs may be separated by spaces
+    save_path = path_entry.get()
+    sub_format = subtitle_format_combobox.get()
+    include_auto = subtitle_auto_checkbox.get() == 1
+
+    if not urls: messagebox.showwarning("Input Error", "Please enter one or more YouTube video or playlist URLs."); return
+    if not save_path or not os.path.isdir(save_path): messagebox.showwarning("Input Error", f"Please select a valid download directory."); return
+    if sub_format not in SUBTITLE_FORMATS: messagebox.showwarning("Input Error", "Please select a subtitle format."); return
+    try:
+        lang_patterns = parse_subtitle_languages(subtitle_langs_entry.get())
+    except re.error as e:
+        messagebox.showwarning("Input Error", f"Invalid subtitle language filter:\n{e}"); return
+    if not check_yt_dlp(): return
+
+    ui_set_controls_state(False)
+    ui_set_fetch_button_state(False)
+    status_label.configure(text="Status: Preparing subtitle batch...")
+    progress_bar.set(0)
+    app.update_idletasks()
+
+    print("-" * 20)
+    print(f"DEBUG: Starting Subtitle Batch Job")
+    print(f"DEBUG: URLs: {urls}")
+    print(f"DEBUG: Languages: '{subtitle_langs_entry.get() or 'all'}'")
+    print(f"DEBUG: Format: '{sub_format}'")
+    print(f"DEBUG: Include Auto Captions: {include_auto}")
+    print(f"DEBUG: Save Path: '{save_path}'")
+    print("-" * 20)
+
+    batch_thread = threading.Thread(
+        target=subtitle_batch_thread,
+        args=(urls, lang_patterns, sub_format, include_auto, save_path),
+        daemon=True
+    )
+    batch_thread.start()
+
 # --- UI Helper Functions ---
 def ui_set_controls_state(enabled: bool):
     """Enable/disable download-related controls."""
@@ -440,10 +764,6 @@ def ui_set_controls_state(enabled: bool):
     except Exception: pass
     try: caption_combobox.configure(state="readonly" if enabled else "disabled")
     except Exception: pass
-    try: path_entry.configure(state=state)
-    except Exception: pass
-    try: path_button.configure(state=state)
-    except Exception: pass
     try: audio_only_checkbox.configure(state=state)
     except Exception: pass
 
@@ -469,6 +789,20 @@ def ui_set_controls_state(enabled: bool):
 def ui_set_fetch_button_state(enabled: bool):
      try: fetch_button.configure(state="normal" if enabled else "disabled")
      except Exception: pass
+     # The save path and the subtitle batch need no prior fetch, so they follow the fetch button rather than the download controls
+     state = "normal" if enabled else "disabled"
+     try: path_entry.configure(state=state)
+     except Exception: pass
+     try: path_button.configure(state=state)
+     except Exception: pass
+     try: subtitle_batch_button.configure(state=state)
+     except Exception: pass
+     try: subtitle_langs_entry.configure(state=state)
+     except Exception: pass
+     try: subtitle_format_combobox.configure(state="readonly" if enabled else "disabled")
+     except Exception: pass
+     try: subtitle_auto_checkbox.configure(state=state)
+     except Exception: pass
 
 def ui_set_download_button_state(enabled: bool):
     has_formats = bool(available_formats)
@@ -533,7 +867,7 @@ def clear_url_and_info():
 # --- GUI Setup using CustomTkinter ---
 app = ctk.CTk()
 app.title("Advanced YouTube Downloader (vhr)")
-app.geometry("800x750")
+app.geometry("800x850")
 
 # --- Main Frame ---
 main_frame = ctk.CTkFrame(app)
@@ -628,18 +962,38 @@ archive_button = ctk.CTkButton(output_options_frame, text="Select File...", widt
 archive_button.grid(row=3, column=2, padx=(0, 10), pady=5)
 
 
-# --- Row 5: Download Action ---
+# --- Row 5: Subtitle Batch ---
+subtitle_batch_frame = ctk.CTkFrame(main_frame)
+subtitle_batch_frame.grid(row=5, column=0, padx=10, pady=5, sticky="ew")
+subtitle_batch_frame.grid_columnconfigure(1, weight=1)
+
+subtitle_langs_label = ctk.CTkLabel(subtitle_batch_frame, text="Subtitle Batch:")
+subtitle_langs_label.grid(row=0, column=0, padx=(10, 5), pady=5, sticky="w")
+subtitle_langs_entry = ctk.CTkEntry(subtitle_batch_frame, placeholder_text="Languages: all, or e.g. en,es,pt.* (en also takes en-US; case ignored)")
+subtitle_langs_entry.grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+subtitle_format_combobox = ctk.CTkComboBox(subtitle_batch_frame, state="readonly", width=80, values=SUBTITLE_FORMATS)
+subtitle_format_combobox.set(SUBTITLE_FORMATS[0])
+subtitle_format_combobox.grid(row=0, column=2, padx=5, pady=5)
+subtitle_batch_button = ctk.CTkButton(subtitle_batch_frame, text="Download Subtitles Only", width=160, command=start_subtitle_batch)
+subtitle_batch_button.grid(row=0, column=3, padx=(0, 10), pady=5)
+subtitle_auto_checkbox = ctk.CTkCheckBox(subtitle_batch_frame, text="Include auto-generated captions (when no manual track; original language only unless filtered)")
+subtitle_auto_checkbox.grid(row=1, column=1, columnspan=3, padx=5, pady=(0, 5), sticky="w")
+subtitle_help_label = ctk.CTkLabel(subtitle_batch_frame, text="(all videos of the URL(s)/playlists; languages already in Save To are skipped)", text_color="gray", font=ctk.CTkFont(size=10))
+subtitle_help_label.grid(row=2, column=1, columnspan=3, padx=5, pady=(0, 5), sticky="w")
+
+
+# --- Row 6: Download Action ---
 download_frame = ctk.CTkFrame(main_frame)
-download_frame.grid(row=5, column=0, padx=10, pady=10, sticky="ew")
+download_frame.grid(row=6, column=0, padx=10, pady=10, sticky="ew")
 download_frame.grid_columnconfigure(0, weight=1)
 
 download_button = ctk.CTkButton(download_frame, text="Download", command=start_download, state="disabled", height=40, font=ctk.CTkFont(size=16, weight="bold"))
 download_button.grid(row=0, column=0, pady=10)
 
 
-# --- Row 6: Progress ---
+# --- Row 7: Progress ---
 progress_frame = ctk.CTkFrame(main_frame)
-progress_frame.grid(row=6, column=0, padx=10, pady=(5, 10), sticky="ew")
+progress_frame.grid(row=7, column=0, padx=10, pady=(5, 10), sticky="ew")
 progress_frame.grid_columnconfigure(0, weight=1)
 
 status_label = ctk.CTkLabel(progress_frame, text="Status: Idle. Install yt-dlp (pip install yt-dlp) if needed.", anchor="w")